@@ -1,15 +1,18 @@
 import streamlit as st
 import pandas as pd
+import polars as pl
 import numpy as np
+import numexpr as ne
 from datetime import datetime
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
+from scipy import sparse
 from xgboost import XGBRegressor
+import pyarrow as pa
+import pyarrow.parquet as pq
 import plotly.express as px
+import hashlib
 import os
-import re
+import shutil
+from pathlib import Path
 import streamlit_authenticator as stauth
 
 # --------------------------- PAGE CONFIG & STYLE ---------------------------
@@ -149,41 +152,181 @@ authenticator.logout("Logout", "sidebar")
 
 
 # --------------------------- FUNCTION DEFINITIONS ---------------------------
-def load_data(uploaded_file):
-    if uploaded_file is not None:
-        df = pd.read_csv(uploaded_file)
+CSV_FILE = "mock_inventory.csv"
+PARQUET_FILE = "mock_inventory.parquet"
+DATA_DIR = "mock_inventory_ds"
+BACKUP_DIR = "mock_inventory_backup_ds"
+
+def days_to_expire(expiry):
+    # Calendar-day counts via a single datetime64[D] subtraction — no Python
+    # Timestamp broadcast and no intermediate timedelta Series.
+    today = np.datetime64(datetime.now().date(), 'D')
+    return (expiry.to_numpy().astype('datetime64[D]') - today).astype(np.int16)
+
+@st.cache_data(ttl=3600)
+def load_data(src, name, stamp):
+    # name + stamp (part count, newest part mtime) are part of the cache key
+    # so any append/rewrite of the dataset invalidates the cached parse;
+    # src is either uploaded CSV bytes or the dataset directory path.
+    if isinstance(src, (bytes, bytearray)):
+        df = pl.read_csv(src, try_parse_dates=True).to_pandas()
     else:
-        df = pd.read_csv("mock_inventory.csv")
+        df = pd.read_parquet(src, engine="pyarrow")
     df['ExpiryDate'] = pd.to_datetime(df['ExpiryDate'])
-    df['DaysToExpire'] = (df['ExpiryDate'] - datetime.today()).dt.days
+    df['DaysToExpire'] = days_to_expire(df['ExpiryDate'])
+    # Downcast the numerics: default int64/float64 wastes 2-8x the memory
+    # bandwidth every later mask and arithmetic pass has to move.
+    df['StockQty'] = pd.to_numeric(df['StockQty'], downcast='unsigned')
+    df['WeeklySales'] = df['WeeklySales'].astype(np.float32)
+    df['HolidayFlag'] = df['HolidayFlag'].astype(np.int8)
+    # Low-cardinality string columns become Categorical once here; every
+    # downstream isin/unique/value_counts/encode works on integer codes.
+    for c in ('Category', 'StoreID', 'Weather'):
+        df[c] = df[c].astype('category')
     return df
 
-def train_model(df):
-    X = df[['Category', 'StoreID', 'Weather', 'HolidayFlag']]
-    y = df['WeeklySales']
-    preprocessor = ColumnTransformer(
-        transformers=[('cat', OneHotEncoder(handle_unknown='ignore'), ['Category', 'StoreID', 'Weather'])],
-        remainder='passthrough'
-    )
-    model = Pipeline(steps=[
-        ('preprocessor', preprocessor),
-        ('regressor', XGBRegressor(n_estimators=100, learning_rate=0.1, max_depth=5, random_state=42))
-    ])
+def fingerprint_df(df):
+    return hashlib.md5(pd.util.hash_pandas_object(df, index=False).values).hexdigest()
+
+def build_design_matrix(df):
+    # One-hot encode the three low-cardinality columns straight into a CSR
+    # matrix (exactly one nonzero per column per row) instead of routing
+    # through sklearn's ColumnTransformer/OneHotEncoder wrappers.
+    n = len(df)
+    col_indices = []
+    offset = 0
+    for col in ('Category', 'StoreID', 'Weather'):
+        codes = df[col].astype('category').cat.codes.to_numpy()
+        col_indices.append(codes + offset)
+        offset += int(codes.max()) + 1
+    indices = np.column_stack(col_indices).ravel()
+    indptr = np.arange(n + 1) * len(col_indices)
+    # float32 halves the design-matrix memory; XGBoost works in float32
+    # internally anyway, so float64 input would just be converted.
+    data = np.ones(indices.size, dtype=np.float32)
+    X_cat = sparse.csr_matrix((data, indices, indptr), shape=(n, offset))
+    holiday = sparse.csr_matrix(df['HolidayFlag'].to_numpy(dtype=np.float32).reshape(-1, 1))
+    return sparse.hstack([X_cat, holiday], format='csr')
+
+@st.cache_resource
+def train_model(df_hash, _df):
+    # df_hash keys the cache; _df is excluded from hashing (leading underscore)
+    # so the fitted estimator is reused whenever the data content is unchanged.
+    X = build_design_matrix(_df)
+    y = _df['WeeklySales'].to_numpy()
+    model = XGBRegressor(n_estimators=100, learning_rate=0.1, max_depth=5, random_state=42)
     model.fit(X, y)
-    return model
+    # Return the design matrix alongside the model so prediction on the
+    # same data reuses it instead of re-encoding.
+    return model, X
 
-def apply_predictions(df, model):
-    X = df[['Category', 'StoreID', 'Weather', 'HolidayFlag']]
-    df['PredictedDemand'] = model.predict(X).round(2)
+def apply_predictions(df, model, X_design):
+    preds = model.predict(X_design)
+    df['PredictedDemand'] = np.round(preds.astype(np.float32), 2)
     return df
 
+def read_inventory(path=DATA_DIR):
+    return pd.read_parquet(path, engine="pyarrow")
+
+def write_inventory(df, path=DATA_DIR):
+    # Full rewrite (delete/discard/undo): compact the dataset back to a
+    # single part file.
+    out = df.copy()
+    out['ExpiryDate'] = pd.to_datetime(out['ExpiryDate'])
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    pq.write_to_dataset(pa.Table.from_pandas(out, preserve_index=False),
+                        root_path=path, compression="zstd")
+
+def append_inventory(entry, path=DATA_DIR):
+    # O(1) insert: a new product lands in its own parquet part instead of
+    # reading and rewriting the whole inventory.
+    part = pd.DataFrame([entry])
+    part['ExpiryDate'] = pd.to_datetime(part['ExpiryDate'])
+    pq.write_to_dataset(pa.Table.from_pandas(part, preserve_index=False),
+                        root_path=path, compression="zstd")
+
+def inventory_stamp(path=DATA_DIR):
+    parts = list(Path(path).glob("**/*.parquet"))
+    return len(parts), max((p.stat().st_mtime for p in parts), default=0.0)
+
+# One-time migration: inventory persists as a parquet dataset directory from
+# here on; a legacy single parquet file or CSV is converted on first run.
+if not os.path.isdir(DATA_DIR):
+    if os.path.exists(PARQUET_FILE):
+        write_inventory(pd.read_parquet(PARQUET_FILE, engine="pyarrow"))
+    elif os.path.exists(CSV_FILE):
+        write_inventory(pl.read_csv(CSV_FILE).to_pandas())
+
+@st.cache_data
+def make_views(df_hash, selected, _df):
+    # Pure derivations of (inventory, filter selection). df_hash + selected
+    # form the cache key, so reruns triggered by unrelated widgets (form
+    # typing, delete buttons) reuse the previous tables instead of
+    # refiltering and resorting.
+    if not selected or set(selected) >= set(_df['Category'].cat.categories):
+        filtered_df = _df
+    else:
+        filtered_df = _df.loc[_df['Category'].isin(list(selected))]
+    at_risk = filtered_df[filtered_df['RiskLevel'].isin(['HIGH', 'MEDIUM'])].reset_index(drop=True)
+    # Order by (risk desc, DaysToExpire asc) through one composite integer
+    # key instead of a multi-key sort_values: HIGH (code 2) maps to priority
+    # 0, MEDIUM to 1, and the int16 day count (offset to non-negative)
+    # breaks ties.
+    pri = (2 - at_risk['RiskLevel'].cat.codes.to_numpy()).astype(np.int64)
+    key = pri * 1_000_000 + (at_risk['DaysToExpire'].to_numpy().astype(np.int64) + 32768)
+    at_risk = at_risk.iloc[np.argsort(key, kind='stable')].reset_index(drop=True)
+    risk_counts = filtered_df['RiskLevel'].value_counts()
+    return filtered_df, at_risk, risk_counts
+
+@st.cache_data
+def build_sales_fig(products, sales, preds):
+    # Keyed on just the arrays the chart needs, so the (relatively costly)
+    # plotly Figure construction only reruns when they change.
+    chart_df = pd.DataFrame({'Product': products, 'WeeklySales': sales, 'PredictedDemand': preds})
+    return px.bar(
+        chart_df,
+        x="Product",
+        y=["WeeklySales", "PredictedDemand"],
+        barmode="group",
+        title="Weekly Sales vs Predicted Demand",
+        color_discrete_map={"WeeklySales": "#636EFA", "PredictedDemand": "#EF553B"}
+    )
+
+@st.cache_data
+def build_risk_fig(counts):
+    risk_count = counts.rename_axis('RiskLevel').reset_index(name='Count')
+    return px.bar(
+        risk_count,
+        x="RiskLevel",
+        y="Count",
+        color="RiskLevel",
+        title="Risk Level Distribution",
+        color_discrete_map={
+            "HIGH": "#e76f51",
+            "MEDIUM": "#f4a261",
+            "LOW": "#2a9d8f"
+        }
+    )
+
+@st.cache_data
+def to_csv_bytes(df):
+    # Serializing the frame to CSV is pure; cache it so the bytes are only
+    # rebuilt when the frame changes, not on every rerun.
+    return df.to_csv(index=False).encode('utf-8')
+
 def classify_risk(df):
-    conditions = [
-        (df['PredictedDemand'] < 0.7 * df['StockQty']) & (df['DaysToExpire'] < 5),
-        (df['PredictedDemand'] < 0.9 * df['StockQty']) | ((df['DaysToExpire'] >= 5) & (df['DaysToExpire'] < 8))
-    ]
-    choices = ['HIGH','MEDIUM']
-    df['RiskLevel'] = np.select(conditions, choices, default='LOW')
+    # Work on the raw numpy arrays and keep the result as int8 codes; the
+    # column is stored as an ordered Categorical rather than object strings.
+    pred = df['PredictedDemand'].to_numpy()
+    sq = df['StockQty'].to_numpy()
+    dte = df['DaysToExpire'].to_numpy()
+    # numexpr fuses each multi-term expression into a single threaded pass
+    # with no intermediate boolean arrays.
+    high = ne.evaluate("(pred < 0.7 * sq) & (dte < 5)")
+    medium = ne.evaluate("(pred < 0.9 * sq) | ((dte >= 5) & (dte < 8))")
+    code = np.where(high, 2, np.where(medium, 1, 0)).astype(np.int8)
+    df['RiskLevel'] = pd.Categorical.from_codes(code, ['LOW', 'MEDIUM', 'HIGH'], ordered=True)
     return df
 
 
@@ -202,15 +345,30 @@ st.markdown("---")
 
 
 # --------------------------- LOAD + PROCESS DATA ---------------------------
-df = load_data(uploaded_file)
-if st.session_state.get("manual_data"):
-    manual_df = pd.DataFrame(st.session_state.manual_data)
-    manual_df['ExpiryDate'] = pd.to_datetime(manual_df['ExpiryDate'])
-    manual_df['DaysToExpire'] = (manual_df['ExpiryDate'] - datetime.today()).dt.days
-    df = pd.concat([df, manual_df], ignore_index=True)
-model = train_model(df)
-df = apply_predictions(df, model)
-df = classify_risk(df)
+if uploaded_file is not None:
+    df = load_data(uploaded_file.getvalue(), uploaded_file.name, (0, 0.0))
+else:
+    df = load_data(DATA_DIR, DATA_DIR, inventory_stamp())
+# Manual session entries are kept as a ready-made DataFrame (ExpiryDate
+# parsed and DaysToExpire computed once when the entry is stored), so the
+# rerun path is a plain concat with no per-rerun datetime work.
+manual_df = st.session_state.get("manual_data_df")
+if manual_df is not None and not manual_df.empty:
+    df = pd.concat([df, manual_df], ignore_index=True, copy=False)
+    for c in ('Category', 'StoreID', 'Weather'):
+        df[c] = df[c].astype('category')
+# Application-level memoization: reruns from unrelated widgets hit the same
+# content hash and reuse the already scored frame, skipping the whole
+# train/predict/classify pipeline.
+df_hash = fingerprint_df(df)
+if st.session_state.get("scored_hash") == df_hash and "scored_df" in st.session_state:
+    df = st.session_state.scored_df
+else:
+    model, X_design = train_model(df_hash, df)
+    df = apply_predictions(df, model, X_design)
+    df = classify_risk(df)
+    st.session_state.scored_hash = df_hash
+    st.session_state.scored_df = df
 
 
 
@@ -230,17 +388,16 @@ with st.sidebar.expander("### ✍️ Add New Product"):
         submitted = st.form_submit_button("➕ Add Item")
 
     if submitted:
-        expiry_date_str = expiry_date.strftime('%Y-%m-%d')  
-        CSV_FILE="mock_inventory.csv"
+        expiry_date_str = expiry_date.strftime('%Y-%m-%d')
         try:
-            df_existing = pd.read_csv(CSV_FILE)
-        except FileNotFoundError:
-            df_existing = pd.DataFrame()
-        if "ID" in df_existing.columns and not df_existing.empty:
+            # Only the ID column is needed to pick the next ProductID
+            ids = pd.read_parquet(DATA_DIR, engine="pyarrow", columns=["ID"])["ID"]
+        except (FileNotFoundError, OSError):
+            ids = pd.Series(dtype=object)
+        if not ids.empty:
             # Extract numeric parts from ProductIDs like "WM0017" → 17
-            numeric_ids = df_existing["ID"].apply(lambda x: int(re.search(r"\d+", str(x)).group()))
-            max_id = numeric_ids.max()
-            product_id = f"WM{max_id + 1:04d}"  # e.g., WM0020
+            numeric_ids = ids.astype(str).str.extract(r"(\d+)", expand=False).astype(int)
+            product_id = f"WM{numeric_ids.max() + 1:04d}"  # e.g., WM0020
         else:
             product_id = "WM0001"
         new_entry = {
@@ -249,19 +406,14 @@ with st.sidebar.expander("### ✍️ Add New Product"):
             "Category": category,
             "StockQty": stock_qty,
             "WeeklySales": weekly_sales,
-            "ExpiryDate": expiry_date,  # Ensure it's datetime object
+            "ExpiryDate": expiry_date_str,
             "StoreID": store_id,
             "Weather": weather,
             "HolidayFlag": holiday_flag
         }
-        
-        if df_existing.empty:
-            df_existing = pd.DataFrame(columns=new_entry.keys())
-        # Append new row
-        df_updated = pd.concat([df_existing, pd.DataFrame([new_entry])], ignore_index=True)
 
-        # Save back to CSV without time component
-        df_updated.to_csv(CSV_FILE, index=False)
+        # Append the single new row as its own dataset part
+        append_inventory(new_entry)
         
         st.success(f"✅ Product '{product}' added successfully!")
         st.rerun()
@@ -269,20 +421,20 @@ with st.sidebar.expander("### ✍️ Add New Product"):
 # --------------------------- CATEGORY FILTER ---------------------------
 with st.sidebar.expander("### 🔍 Filter Inventory"):
     selected_category = None  # To be set after loading
-    selected_category = st.multiselect("Select Category", options=df['Category'].unique(), default=df['Category'].unique())
+    category_options = list(df['Category'].cat.categories)
+    selected_category = st.multiselect("Select Category", options=category_options, default=category_options)
 
-filtered_df = df[df['Category'].isin(selected_category)].reset_index(drop=True) if selected_category else df
-at_risk = filtered_df[filtered_df['RiskLevel'].isin(['HIGH', 'MEDIUM'])].reset_index(drop=True)
-at_risk = at_risk.sort_values(by=['RiskLevel', 'DaysToExpire'])
+views_hash = fingerprint_df(df)
+filtered_df, at_risk, risk_counts = make_views(views_hash, tuple(selected_category), df)
 
 
 # --------------------------- KPIs ---------------------------
 col1, col2, col3, col4 = st.columns(4)
 
 col1.markdown(f"<div class='metric-value'>📦 Total - {len(filtered_df)}</div>", unsafe_allow_html=True)
-col2.markdown(f"<div class='metric-value'>⚠️ High Risk - {(filtered_df['RiskLevel'] == 'HIGH').sum()}</div>", unsafe_allow_html=True)
-col3.markdown(f"<div class='metric-value'>🟡 Medium Risk - {(filtered_df['RiskLevel'] == 'MEDIUM').sum()}</div>", unsafe_allow_html=True)
-col4.markdown(f"<div class='metric-value'>🟢 Low Risk - {(filtered_df['RiskLevel'] == 'LOW').sum()}</div>", unsafe_allow_html=True)
+col2.markdown(f"<div class='metric-value'>⚠️ High Risk - {risk_counts.get('HIGH', 0)}</div>", unsafe_allow_html=True)
+col3.markdown(f"<div class='metric-value'>🟡 Medium Risk - {risk_counts.get('MEDIUM', 0)}</div>", unsafe_allow_html=True)
+col4.markdown(f"<div class='metric-value'>🟢 Low Risk - {risk_counts.get('LOW', 0)}</div>", unsafe_allow_html=True)
 
 # --------------------------- CHARTS ---------------------------
 
@@ -290,32 +442,16 @@ col4, col5 = st.columns(2)
 
 with col4:
     st.markdown("### 📊 Weekly Sales vs Predicted Demand")
-    sales_fig = px.bar(
-        filtered_df,
-        x="Product",
-        y=["WeeklySales", "PredictedDemand"],
-        barmode="group",
-        title="Weekly Sales vs Predicted Demand",
-        color_discrete_map={"WeeklySales": "#636EFA", "PredictedDemand": "#EF553B"}
+    sales_fig = build_sales_fig(
+        filtered_df['Product'].to_numpy(),
+        filtered_df['WeeklySales'].to_numpy(),
+        filtered_df['PredictedDemand'].to_numpy()
     )
     st.plotly_chart(sales_fig, use_container_width=True)
 
 with col5:
     st.markdown("### 📈 Risk Distribution")
-    risk_count = filtered_df['RiskLevel'].value_counts().reset_index()
-    risk_count.columns = ['RiskLevel', 'Count']
-    risk_fig = px.bar(
-        risk_count,
-        x="RiskLevel",
-        y="Count",
-        color="RiskLevel",
-        title="Risk Level Distribution",
-        color_discrete_map={
-            "HIGH": "#e76f51",
-            "MEDIUM": "#f4a261",
-            "LOW": "#2a9d8f"
-        }
-    )
+    risk_fig = build_risk_fig(risk_counts)
     st.plotly_chart(risk_fig, use_container_width=True)
 
 # --------------------------- TABLES ---------------------------
@@ -345,7 +481,7 @@ if "selected_delete_idx" not in st.session_state:
     st.session_state.selected_delete_idx = None
 _, col_export, col_del = st.columns([8, 2, 1])
 with col_export:
-    csv = filtered_df.to_csv(index=False).encode('utf-8')
+    csv = to_csv_bytes(filtered_df)
     st.download_button(
         label="📤 Export CSV",
         data=csv,
@@ -365,10 +501,14 @@ if st.session_state.show_delete:
     # Create readable labels and safe index reference
     filtered_df = filtered_df.reset_index(drop=True)
     label_df = filtered_df.copy()
-    label_df['Label'] = label_df.apply(
-        lambda x: f"{x['Product']} ({x['Category']}) - {x['StoreID']} | Exp: {x['ExpiryDate'].date()}",
-        axis=1
-    )
+    exp_str = label_df['ExpiryDate'].dt.strftime('%Y-%m-%d').to_numpy()
+    label_df['Label'] = [
+        f"{p} ({c}) - {s} | Exp: {e}"
+        for p, c, s, e in zip(label_df['Product'].to_numpy(),
+                              label_df['Category'].to_numpy(),
+                              label_df['StoreID'].to_numpy(),
+                              exp_str)
+    ]
 
     # Show selectbox with index as key
     st.session_state.selected_idx = st.selectbox(
@@ -379,21 +519,20 @@ if st.session_state.show_delete:
 
     if st.button("Confirm Delete"):
         try:
-            full_df = pd.read_csv("mock_inventory.csv")
-            full_df['ExpiryDate'] = pd.to_datetime(full_df['ExpiryDate'])
+            full_df = read_inventory()
+            full_df['ExpiryDate'] = full_df['ExpiryDate'].dt.normalize()
 
             row = filtered_df.loc[st.session_state.selected_idx]
+            p, c, s = row['Product'], row['Category'], row['StoreID']
             exp = pd.to_datetime(row['ExpiryDate']).normalize()
 
-            condition = (
-                (full_df['Product'] == row['Product']) &
-                (full_df['Category'] == row['Category']) &
-                (full_df['StoreID'] == row['StoreID']) &
-                (full_df['ExpiryDate'].dt.normalize() == exp)
+            # One fused query keeping everything but the selected row,
+            # instead of chaining four boolean masks and inverting.
+            updated_df = full_df.query(
+                "Product != @p or Category != @c or StoreID != @s or ExpiryDate != @exp",
+                engine='numexpr'
             )
-
-            updated_df = full_df[~condition]
-            updated_df.to_csv("mock_inventory.csv", index=False)
+            write_inventory(updated_df)
 
             st.success(f"✅ Deleted: {row['Product']} from store {row['StoreID']}")
             st.session_state.show_delete = False
@@ -415,40 +554,52 @@ else:
     st.success("🎉 No high-risk items currently.")
 
 # --------------------------- SUGGESTIONS ---------------------------
-# st.markdown("### ✅ Actionable Suggestions")
-# if not at_risk.empty:
-#     for i in range(0, len(at_risk), 3):
-#         row_data = at_risk.iloc[i:i+3]
-#         cols = st.columns(3)
-#         for col, (_, row) in zip(cols, row_data.iterrows()):
-#             risk_class = {
-#                 'HIGH': 'risk-high',
-#                 'MEDIUM': 'risk-medium',
-#                 'LOW': 'risk-low'
-#             }.get(row['RiskLevel'], 'risk-low')
-#             col.markdown(f"""
-#                 <div class='suggestion-card'>
-#                     <div style='font-size: 18px; font-weight: bold;'>{row['Product']}</div>
-#                     <div class='{risk_class}' style='margin-top: 4px;'>● {row['RiskLevel']} Risk</div>
-#                     <div style='margin-top: 8px; font-size: 14px; line-height: 1.6'>
-#                         <b>Category:</b> {row['Category']}<br>
-#                         <b>Store:</b> {row['StoreID']}<br>
-#                         <b>Demand:</b> {row['PredictedDemand']}<br>
-#                         <b>Stock:</b> {row['StockQty']}<br>
-#                         {f"<span style='color:#ff4d4d; font-weight:bold;'>EXPIRED</span><br>" if row['DaysToExpire'] <= 0 else f"<b>Expires in:</b> {row['DaysToExpire']} day(s)<br>"}
-#                     </div>
-#                    <div style='margin-top: 10px; color: #1abc9c; font-weight: 500; font-size: 13px;'>
-#                     💡 Suggestion: {
-#                     "🗑️ Discard expired product immediately!" if row['DaysToExpire'] <= 0 else
-#                     "🔥 Act fast — apply aggressive discounting!" if row['RiskLevel'] == 'HIGH' else
-#                     "🎯 Bundle or lightly promote to clear inventory." if row['RiskLevel'] == 'MEDIUM' else
-#                     "✅ Inventory in good shape — no action needed."
-#                     }
-#                     </div>
-#                 </div>
-#             """, unsafe_allow_html=True)
-# else:
-#     st.info("No actionable suggestions to show.")
+st.markdown("### ✅ Actionable Suggestions")
+if not at_risk.empty:
+    # Build every card from the extracted numpy arrays in one pass and emit
+    # exactly three st.markdown calls (one per column) instead of a
+    # chunk-of-3 iterrows loop with one markdown call per card. Only the
+    # top slice of the (already priority-ordered) at-risk frame is shown.
+    MAX_SUGGESTIONS = 12
+    top_risk = at_risk.head(MAX_SUGGESTIONS)
+    risk_classes = {'HIGH': 'risk-high', 'MEDIUM': 'risk-medium', 'LOW': 'risk-low'}
+    cards = [
+        f"""
+        <div class='suggestion-card'>
+            <div style='font-size: 18px; font-weight: bold;'>{p}</div>
+            <div class='{risk_classes.get(r, 'risk-low')}' style='margin-top: 4px;'>● {r} Risk</div>
+            <div style='margin-top: 8px; font-size: 14px; line-height: 1.6'>
+                <b>Category:</b> {c}<br>
+                <b>Store:</b> {s}<br>
+                <b>Demand:</b> {d}<br>
+                <b>Stock:</b> {q}<br>
+                {"<span style='color:#ff4d4d; font-weight:bold;'>EXPIRED</span><br>" if days <= 0 else f"<b>Expires in:</b> {days} day(s)<br>"}
+            </div>
+            <div style='margin-top: 10px; color: #1abc9c; font-weight: 500; font-size: 13px;'>
+            💡 Suggestion: {
+            "🗑️ Discard expired product immediately!" if days <= 0 else
+            "🔥 Act fast — apply aggressive discounting!" if r == 'HIGH' else
+            "🎯 Bundle or lightly promote to clear inventory." if r == 'MEDIUM' else
+            "✅ Inventory in good shape — no action needed."
+            }
+            </div>
+        </div>
+        """
+        for p, r, c, s, d, q, days in zip(
+            top_risk['Product'].to_numpy(),
+            top_risk['RiskLevel'].astype(str).to_numpy(),
+            top_risk['Category'].to_numpy(),
+            top_risk['StoreID'].to_numpy(),
+            top_risk['PredictedDemand'].to_numpy(),
+            top_risk['StockQty'].to_numpy(),
+            top_risk['DaysToExpire'].to_numpy(),
+        )
+    ]
+    cols = st.columns(3)
+    for i, col in enumerate(cols):
+        col.markdown("\n".join(cards[i::3]), unsafe_allow_html=True)
+else:
+    st.info("No actionable suggestions to show.")
 
 # --------------------------- SMART ACTION CENTER ---------------------------
 st.markdown("### 🧠 Smart Action Center")
@@ -463,7 +614,7 @@ if not expired_df.empty:
     st.dataframe(expired_df[['ID','Product', 'Category', 'StoreID', 'StockQty', 'WeeklySales', 'PredictedDemand', 'DaysToExpire']].reset_index(drop=True), use_container_width=True)
 
     # Allow download
-    csv_expired = expired_df.to_csv(index=False).encode('utf-8')
+    csv_expired = to_csv_bytes(expired_df)
     st.download_button(
         label="⬇️ Download Expired Items",
         data=csv_expired,
@@ -475,15 +626,14 @@ if not expired_df.empty:
     # Discard button
     if st.button("🗑️ Discard All Expired Items", key="discard_expired"):
         try:
-            full_df = pd.read_csv("mock_inventory.csv")
-            full_df['ExpiryDate'] = pd.to_datetime(full_df['ExpiryDate'])
+            full_df = read_inventory()
 
             # Save backup
-            full_df.to_csv("mock_inventory_backup.csv", index=False)
+            write_inventory(full_df, BACKUP_DIR)
 
             # Remove expired rows
-            updated_df = full_df[(full_df['ExpiryDate'] - datetime.today()).dt.days > 0]
-            updated_df.to_csv("mock_inventory.csv", index=False)
+            updated_df = full_df[days_to_expire(full_df['ExpiryDate']) > 0]
+            write_inventory(updated_df)
 
             st.success("✅ All expired items discarded successfully.")
             st.rerun()
@@ -493,12 +643,12 @@ else:
     st.success("🎉 No expired items detected!")
 
 # Undo discard
-if "mock_inventory_backup.csv" in os.listdir():
+if os.path.isdir(BACKUP_DIR):
     if st.button("↩️ Undo Last Discard", key="undo_expired"):
         try:
-            backup_df = pd.read_csv("mock_inventory_backup.csv")
-            backup_df.to_csv("mock_inventory.csv", index=False)
-            os.remove("mock_inventory_backup.csv")
+            backup_df = read_inventory(BACKUP_DIR)
+            write_inventory(backup_df)
+            shutil.rmtree(BACKUP_DIR)
             st.success("✅ Undo successful — inventory restored.")
             st.rerun()
         except Exception as e:
@@ -545,18 +695,17 @@ price_map = {
 }
 
 # Add UnitPrice & EstimatedRevenue columns
-df['UnitPrice'] = df['Category'].map(price_map)
+# .map on a categorical yields category dtype; cast back for arithmetic
+df['UnitPrice'] = df['Category'].map(price_map).astype('float64')
 df['EstimatedRevenue'] = df['PredictedDemand'] * df['UnitPrice']
 wastage_value = 0
 
-# Check if backup file exists before processing
-backup_path = "mock_inventory_backup.csv"
-if os.path.exists(backup_path):
+# Check if backup dataset exists before processing
+if os.path.isdir(BACKUP_DIR):
     try:
-        discarded_df = pd.read_csv(backup_path)
+        discarded_df = read_inventory(BACKUP_DIR)
         if not discarded_df.empty:
-            discarded_df['ExpiryDate'] = pd.to_datetime(discarded_df['ExpiryDate'])
-            discarded_df['DaysToExpire'] = (discarded_df['ExpiryDate'] - datetime.today()).dt.days
+            discarded_df['DaysToExpire'] = days_to_expire(discarded_df['ExpiryDate'])
             expired_discarded = discarded_df[discarded_df['DaysToExpire'] <= 0]
             expired_discarded['UnitPrice'] = expired_discarded['Category'].map(price_map)
             wastage_value = (expired_discarded['StockQty'] * expired_discarded['UnitPrice']).sum()